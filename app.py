@@ -5,16 +5,33 @@ import json
 import queue
 import threading
 import time
+import urllib.parse
+import urllib.request
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
 
-import requests
+import certifi
 import tkinter as tk
+import urllib3
 from tkinter import messagebox
 from tkinter.scrolledtext import ScrolledText
 
 
 REQUEST_TIMEOUT = 60
+# Like requests: follow redirects, but never silently retry a failed request.
+REQUEST_RETRIES = urllib3.Retry(total=None, connect=0, read=0, status=0, other=0, redirect=30)
+POOL_SIZE = 10
+MAX_WORKERS = 8
+POLL_BUSY_MS = 10
+POLL_IDLE_MS = 250
+MAX_HISTORY = 500
+MAX_FORMAT_CHARS = 64 * 1024
+MAX_BODY_BYTES = 1 << 20
+BODY_CHUNK_SIZE = 64 * 1024
+PREVIEW_CHARS = 200
+MAX_DISPLAY_CHARS = 200_000
+TRUNCATED_MARKER = "\n…(truncated)"
 
 
 @dataclass
@@ -43,18 +60,59 @@ class ApiTesterApp:
         self.root.title("Backend Dev Helper")
         self.root.geometry("1100x720")
 
-        self.request_queue: "queue.Queue[RequestHistoryItem]" = queue.Queue()
-        self.response_queue: "queue.Queue[RequestHistoryItem]" = queue.Queue()
-        self.history: List[RequestHistoryItem] = []
-
-        self._build_layout()
+        self.response_queue: "queue.Queue[Tuple[RequestHistoryItem, Dict[str, str]]]" = queue.Queue()
+        # Oldest entries are evicted once the history reaches MAX_HISTORY items.
+        self.history: Deque[RequestHistoryItem] = deque(maxlen=MAX_HISTORY)
+        self._pending = 0
+        # Requests submitted but not yet drained by _poll_queue, keyed by id().
+        self._in_flight: Dict[int, RequestHistoryItem] = {}
+        self._poll_after_id: Optional[str] = None
+
+        # Like requests: verify against certifi's CA bundle and honour the
+        # HTTP(S)_PROXY / NO_PROXY environment (or system) proxy settings.
+        self._http = urllib3.PoolManager(
+            num_pools=POOL_SIZE, maxsize=POOL_SIZE, ca_certs=certifi.where()
+        )
+        self._proxies: Dict[str, urllib3.ProxyManager] = {}
+        for scheme, proxy_url in urllib.request.getproxies().items():
+            if scheme not in ("http", "https"):
+                continue
+            if "://" not in proxy_url:
+                proxy_url = f"http://{proxy_url}"
+            self._proxies[scheme] = urllib3.ProxyManager(
+                proxy_url, num_pools=POOL_SIZE, maxsize=POOL_SIZE, ca_certs=certifi.where()
+            )
+
+        # A fixed pool of daemon workers, so closing the window never waits on
+        # a slow request the way ThreadPoolExecutor's joined threads would.
+        self.request_queue: "queue.Queue[Optional[Tuple[RequestHistoryItem, float]]]" = queue.Queue()
+        for index in range(MAX_WORKERS):
+            threading.Thread(target=self._worker_loop, name=f"http-{index}", daemon=True).start()
+
+        self._response_panel_ready = False
+        self._deferred_result: Optional[Dict[str, str]] = None
+        self._last_body = ""
+
+        self._build_essential_layout()
+        # The response and tips panels hold the heavier widgets; build them after
+        # the first mainloop iteration so the window appears straight away.
+        self.root.after_idle(self._build_secondary_layout)
         self._start_response_loop()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
-    def _build_layout(self) -> None:
+    def _on_close(self) -> None:
+        for _ in range(MAX_WORKERS):
+            self.request_queue.put(None)
+        self._http.clear()
+        for proxy in self._proxies.values():
+            proxy.clear()
+        self.root.destroy()
+
+    def _build_essential_layout(self) -> None:
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
 
-        main = tk.Frame(self.root)
+        main = self._main_frame = tk.Frame(self.root)
         main.grid(row=0, column=0, sticky="nsew")
         main.columnconfigure(0, weight=0)
         main.columnconfigure(1, weight=1)
@@ -127,6 +185,12 @@ class ApiTesterApp:
             activebackground="#1a947f",
         ).grid(row=3, column=3, sticky="e", padx=5, pady=5)
 
+        self.body_text.bind("<Control-Return>", self._on_send_shortcut)
+        self.body_text.bind("<Command-Return>", self._on_send_shortcut)
+
+    def _build_secondary_layout(self) -> None:
+        main = self._main_frame
+
         # Response panel
         response_frame = tk.LabelFrame(main, text="Response")
         response_frame.grid(row=1, column=1, columnspan=2, sticky="nsew", padx=5, pady=5)
@@ -134,18 +198,21 @@ class ApiTesterApp:
         response_frame.rowconfigure(2, weight=1)
 
         tk.Label(response_frame, text="Status:").grid(row=0, column=0, sticky="w")
-        self.status_var = tk.StringVar(value="-")
-        tk.Label(response_frame, textvariable=self.status_var).grid(row=0, column=0, sticky="e", padx=60)
+        self.status_label = tk.Label(response_frame, text="-")
+        self.status_label.grid(row=0, column=0, sticky="e", padx=60)
 
         tk.Label(response_frame, text="Elapsed:").grid(row=1, column=0, sticky="w")
-        self.elapsed_var = tk.StringVar(value="-")
-        tk.Label(response_frame, textvariable=self.elapsed_var).grid(row=1, column=0, sticky="e", padx=60)
+        self.elapsed_label = tk.Label(response_frame, text="-")
+        self.elapsed_label.grid(row=1, column=0, sticky="e", padx=60)
 
         tk.Label(response_frame, text="Headers:").grid(row=2, column=0, sticky="w")
         self.response_headers_text = ScrolledText(response_frame, height=8)
         self.response_headers_text.grid(row=3, column=0, sticky="nsew", padx=2, pady=2)
 
         tk.Label(response_frame, text="Body:").grid(row=4, column=0, sticky="w")
+        tk.Button(response_frame, text="Format JSON", command=self._format_response_body).grid(
+            row=4, column=0, sticky="e", padx=2
+        )
         self.response_body_text = ScrolledText(response_frame, height=12)
         self.response_body_text.grid(row=5, column=0, sticky="nsew", padx=2, pady=2)
 
@@ -156,100 +223,236 @@ class ApiTesterApp:
         tips_text = (
             "• Use ⌘+Enter / Ctrl+Enter in the body field to send the request quickly.\n"
             "• Provide multiple headers as `Header: Value` per line.\n"
-            "• When the response looks like JSON, it will be automatically formatted."
+            "• JSON responses are formatted automatically; use Format JSON for bodies up to 1 MiB."
         )
         tk.Label(tips_frame, text=tips_text, justify=tk.LEFT, anchor="w").grid(
             row=0, column=0, sticky="w", padx=4, pady=4
         )
 
-        self.body_text.bind("<Control-Return>", lambda event: self._queue_request())
-        self.body_text.bind("<Command-Return>", lambda event: self._queue_request())
+        self._response_panel_ready = True
+        if self._deferred_result is not None:
+            self._display_response(self._deferred_result)
+            self._deferred_result = None
+
+    def _on_send_shortcut(self, event: tk.Event[tk.Text]) -> str:  # type: ignore[name-defined]
+        self._queue_request()
+        return "break"  # keep Tk from inserting a newline into the body
 
     def _queue_request(self) -> None:
         url = self.url_entry.get().strip()
         if not url:
             messagebox.showerror("Missing URL", "Please provide a URL before sending.")
             return
-        method = self.method_var.get().upper()
+        if not url.lower().startswith(("http://", "https://")):
+            messagebox.showerror("Invalid URL", "The URL must start with http:// or https://.")
+            return
+        method = self.method_var.get()
         headers = self._parse_headers(self.headers_text.get("1.0", tk.END))
         body = self.body_text.get("1.0", tk.END).strip()
 
+        # Coalesce repeated Sends while the identical request is still in flight.
+        if self.history:
+            last = self.history[-1]
+            if (
+                id(last) in self._in_flight
+                and (last.method, last.url, last.body) == (method, url, body)
+                and last.headers == headers
+            ):
+                if self._response_panel_ready:
+                    self.status_label.config(text="Pending... (already sent)")
+                return
+
         item = RequestHistoryItem(method=method, url=url, headers=headers, body=body)
+        if len(self.history) == self.history.maxlen:
+            self.history_listbox.delete(tk.END)
         self.history.append(item)
-        self._refresh_history_listbox()
-        self.request_queue.put(item)
-        self.status_var.set("Pending...")
-        self.elapsed_var.set("-")
-        self.response_headers_text.delete("1.0", tk.END)
-        self.response_body_text.delete("1.0", tk.END)
+        self.history_listbox.insert(0, item.display_label())
+        self._in_flight[id(item)] = item
+        self._pending += 1
+        if self._pending == 1 and self._poll_after_id is not None:
+            # Don't wait out the idle tick; start polling at the busy rate now.
+            self.root.after_cancel(self._poll_after_id)
+            self._schedule_poll(POLL_BUSY_MS)
+        self.request_queue.put((item, time.perf_counter()))
+        if self._response_panel_ready:
+            self.status_label.config(text="Pending...")
+            self.elapsed_label.config(text="-")
+            self.response_headers_text.delete("1.0", tk.END)
+            self.response_body_text.delete("1.0", tk.END)
+            self._last_body = ""
+        else:
+            self._deferred_result = None
+
+    def _do_request(self, item: RequestHistoryItem) -> Tuple[RequestHistoryItem, Dict[str, str]]:
+        start = time.perf_counter()
+        try:
+            response = self._pool_for(item.url).request(
+                item.method,
+                item.url,
+                headers=item.headers or None,
+                body=item.body.encode() if item.body else None,
+                timeout=REQUEST_TIMEOUT,
+                retries=REQUEST_RETRIES,
+                preload_content=False,
+            )
+            truncated = True
+            try:
+                raw, truncated = self._read_body(response)
+            finally:
+                if truncated:
+                    # Unread bytes would poison a pooled connection; drop it instead.
+                    response.close()
+                response.release_conn()
+        except urllib3.exceptions.HTTPError as exc:
+            return item, self._failed_result(item, str(exc), time.perf_counter() - start)
+        except Exception as exc:
+            # Errors urllib3 does not wrap, e.g. UnicodeEncodeError from http.client
+            # for header values outside Latin-1.
+            message = f"{type(exc).__name__}: {exc}"
+            return item, self._failed_result(item, message, time.perf_counter() - start)
+        elapsed = time.perf_counter() - start
+        encoding = self._charset(response.headers.get("Content-Type", ""))
+        text = self._decode(raw, encoding)
+        preview = text[:PREVIEW_CHARS].replace("\n", " ")
+        if truncated:
+            text += TRUNCATED_MARKER
+        item.response_status = response.status
+        item.response_time = elapsed
+        item.response_preview = preview
+        result = {
+            "status": f"{response.status} {response.reason}",
+            "elapsed": f"{elapsed:.2f} s",
+            "headers": "\n".join(f"{k}: {v}" for k, v in response.headers.items()),
+            "body": self._format_body(text, response.headers.get("Content-Type", "")),
+        }
+        return item, result
+
+    def _pool_for(self, url: str) -> urllib3.PoolManager:
+        parts = urllib.parse.urlsplit(url)
+        proxy = self._proxies.get(parts.scheme.lower())
+        if proxy is None or urllib.request.proxy_bypass(parts.hostname or ""):
+            return self._http
+        return proxy
 
-        if self.request_queue.qsize() == 1:
-            threading.Thread(target=self._worker_loop, daemon=True).start()
+    @staticmethod
+    def _failed_result(item: RequestHistoryItem, message: str, elapsed: float) -> Dict[str, str]:
+        item.response_status = None
+        item.response_time = elapsed
+        item.response_preview = message
+        return {
+            "status": "Request failed",
+            "elapsed": f"{elapsed:.2f} s",
+            "headers": "",
+            "body": message,
+        }
 
     def _worker_loop(self) -> None:
-        while not self.request_queue.empty():
-            item = self.request_queue.get()
-            start = time.perf_counter()
+        while True:
+            job = self.request_queue.get()
+            if job is None:
+                break
+            item, submitted = job
+            # _do_request reports its own failures; this is a last resort so the item
+            # never stays pending and the poll loop can drop back to its idle interval.
             try:
-                response = requests.request(
-                    method=item.method,
-                    url=item.url,
-                    headers=item.headers or None,
-                    data=item.body or None,
-                    timeout=REQUEST_TIMEOUT,
-                )
-                elapsed = time.perf_counter() - start
-                preview = response.text[:200].replace("\n", " ")
-                item.response_status = response.status_code
-                item.response_time = elapsed
-                item.response_preview = preview
-                result = {
-                    "status": f"{response.status_code} {response.reason}",
-                    "elapsed": f"{elapsed:.2f} s",
-                    "headers": json.dumps(dict(response.headers), indent=2),
-                    "body": self._format_body(response.text),
-                }
-            except requests.exceptions.RequestException as exc:
-                elapsed = time.perf_counter() - start
-                item.response_status = None
-                item.response_time = elapsed
-                item.response_preview = str(exc)
-                result = {
-                    "status": "Request failed",
-                    "elapsed": f"{elapsed:.2f} s",
-                    "headers": "",
-                    "body": str(exc),
-                }
-            self.response_queue.put((item, result))
+                self.response_queue.put(self._do_request(item))
+            except Exception as exc:
+                result = self._failed_result(item, str(exc), time.perf_counter() - submitted)
+                self.response_queue.put((item, result))
+
+    @staticmethod
+    def _read_body(response: urllib3.BaseHTTPResponse) -> Tuple[bytes, bool]:
+        chunks = []
+        total = 0
+        for chunk in response.stream(BODY_CHUNK_SIZE):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total > MAX_BODY_BYTES:
+                return b"".join(chunks)[:MAX_BODY_BYTES], True
+        return b"".join(chunks), False
+
+    @staticmethod
+    def _charset(content_type: str) -> Optional[str]:
+        for param in content_type.split(";")[1:]:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "charset":
+                return value.strip().strip('"') or None
+        return None
+
+    @staticmethod
+    def _decode(raw: bytes, encoding: Optional[str]) -> str:
+        try:
+            return raw.decode(encoding or "utf-8", errors="replace")
+        except LookupError:
+            return raw.decode("utf-8", errors="replace")
 
     def _start_response_loop(self) -> None:
-        def poll_queue() -> None:
-            try:
-                while True:
-                    item, result = self.response_queue.get_nowait()
-                    if item == self.history[-1]:
-                        self._display_response(result)
-                    self._refresh_history_listbox()
-            except queue.Empty:
-                pass
-            finally:
-                self.root.after(150, poll_queue)
+        self._poll_queue()
 
-        poll_queue()
+    def _poll_queue(self) -> None:
+        drained = []
+        try:
+            while True:
+                drained.append(self.response_queue.get_nowait())
+        except queue.Empty:
+            pass
+        self._pending -= len(drained)
+        for item, _ in drained:
+            self._in_flight.pop(id(item), None)
+        try:
+            # Only the newest request is shown in the response panel, so render
+            # at most one response per tick no matter how many completed.
+            latest = None
+            for item, result in drained:
+                if self.history and item is self.history[-1]:
+                    latest = result
+                self._update_history_row(item)
+            if latest is not None:
+                self._display_response(latest)
+        finally:
+            self._schedule_poll(POLL_BUSY_MS if self._pending else POLL_IDLE_MS)
+
+    def _schedule_poll(self, delay_ms: int) -> None:
+        self._poll_after_id = self.root.after(delay_ms, self._poll_queue)
 
     def _display_response(self, result: Dict[str, str]) -> None:
-        self.status_var.set(result["status"])
-        self.elapsed_var.set(result["elapsed"])
-        self.response_headers_text.delete("1.0", tk.END)
-        self.response_headers_text.insert("1.0", result["headers"])
-        self.response_body_text.delete("1.0", tk.END)
-        self.response_body_text.insert("1.0", result["body"])
+        if not self._response_panel_ready:
+            self._deferred_result = result
+            return
+        self.status_label.config(text=result["status"])
+        self.elapsed_label.config(text=result["elapsed"])
+        self._set_text(self.response_headers_text, result["headers"])
+        self._last_body = result["body"]
+        self._set_text(self.response_body_text, result["body"])
+
+    @staticmethod
+    def _set_text(widget: ScrolledText, text: str) -> None:
+        # Inserting megabytes into a Text widget stalls the mainloop, so only
+        # the leading MAX_DISPLAY_CHARS characters are shown.
+        widget.delete("1.0", tk.END)
+        if len(text) > MAX_DISPLAY_CHARS:
+            hidden = len(text) - MAX_DISPLAY_CHARS
+            text = f"{text[:MAX_DISPLAY_CHARS]}\n…(truncated, {hidden} more chars)"
+        widget.insert("1.0", text)
 
     def _refresh_history_listbox(self) -> None:
         self.history_listbox.delete(0, tk.END)
         for item in reversed(self.history):
             self.history_listbox.insert(tk.END, item.display_label())
 
+    def _update_history_row(self, item: RequestHistoryItem) -> None:
+        # The listbox shows the newest entry first, so walk the history backwards.
+        for row, candidate in enumerate(reversed(self.history)):
+            if candidate is item:
+                break
+        else:
+            return  # deleted or cleared while the request was in flight
+        selected = self.history_listbox.selection_includes(row)
+        self.history_listbox.delete(row)
+        self.history_listbox.insert(row, item.display_label())
+        if selected:
+            self.history_listbox.selection_set(row)
+
     def _load_history_item(self, event: tk.Event[tk.Listbox]) -> None:  # type: ignore[name-defined]
         if not self.history:
             return
@@ -291,26 +494,57 @@ class ApiTesterApp:
     @staticmethod
     def _parse_headers(raw: str) -> Dict[str, str]:
         headers: Dict[str, str] = {}
-        for line in raw.strip().splitlines():
-            if not line.strip():
+        invalid: List[str] = []
+        for raw_line in raw.splitlines():
+            line = raw_line.strip()
+            if not line:
                 continue
-            if ":" not in line:
-                messagebox.showwarning(
-                    "Invalid header",
-                    f"Header '{line}' is missing a colon. It will be ignored.",
-                )
+            key, sep, value = line.partition(":")
+            if not sep:
+                invalid.append(line)
                 continue
-            key, value = line.split(":", 1)
             headers[key.strip()] = value.strip()
+        if invalid:
+            messagebox.showwarning(
+                "Invalid headers",
+                "These headers are missing a colon and will be ignored:\n" + "\n".join(invalid),
+            )
         return headers
 
-    @staticmethod
-    def _format_body(body: str) -> str:
+    def _format_response_body(self) -> None:
+        # Format the full body kept from the last response; the widget may only
+        # hold a truncated copy of it.
+        if not self._last_body:
+            return
+        if self._last_body.endswith(TRUNCATED_MARKER):
+            messagebox.showinfo(
+                "Format JSON",
+                "The response body was truncated at 1 MiB and can't be formatted as JSON.",
+            )
+            return
         try:
-            parsed = json.loads(body)
+            formatted = json.dumps(json.loads(self._last_body), indent=2)
         except json.JSONDecodeError:
+            messagebox.showinfo("Format JSON", "The response body is not valid JSON.")
+            return
+        except RecursionError:
+            messagebox.showinfo("Format JSON", "The response body is nested too deeply to format.")
+            return
+        self._last_body = formatted
+        self._set_text(self.response_body_text, self._last_body)
+
+    @staticmethod
+    def _format_body(body: str, content_type: Optional[str] = None) -> str:
+        # Skip the parse/re-serialize round-trip for non-JSON and large bodies;
+        # the latter can still be formatted on demand from the response panel.
+        if content_type and "json" not in content_type.lower():
+            return body
+        if len(body) > MAX_FORMAT_CHARS:
+            return body
+        try:
+            return json.dumps(json.loads(body), indent=2)
+        except (json.JSONDecodeError, RecursionError):
             return body
-        return json.dumps(parsed, indent=2)
 
 
 def main() -> None: